@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Union
 
 class TokenCountRequest(BaseModel):
     """Request model for token counting."""
@@ -16,7 +16,10 @@ class TokenCountResponse(BaseModel):
 
 class BatchTokenCountRequest(BaseModel):
     """Request model for batch token counting."""
-    texts: List[TokenCountRequest] = Field(..., description="List of texts to count tokens for")
+    texts: List[Union[TokenCountRequest, str]] = Field(
+        ...,
+        description="List of texts to count tokens for; plain strings get IDs text1, text2, ..."
+    )
     model: Optional[str] = Field(None, description="Default model to use for all texts")
 
 class BatchTokenCountResponse(BaseModel):
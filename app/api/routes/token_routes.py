@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import Dict, List
+import json
 
 from app.api.models.token_models import (
     TokenCountRequest,
@@ -10,6 +12,7 @@ from app.api.models.token_models import (
 )
 from app.services.token_counter import token_counter
 from app.core.security import verify_credentials, limiter
+from app.core.config import get_settings
 
 router = APIRouter()
 
@@ -44,6 +47,22 @@ async def count_tokens(
             detail=f"Error counting tokens: {str(e)}"
         )
 
+def _batch_texts(batch_request: BatchTokenCountRequest) -> List[Dict]:
+    """Convert a batch request to the format the token counter service expects."""
+    texts = []
+    for i, item in enumerate(batch_request.texts):
+        if isinstance(item, str):
+            # Plain strings get positional IDs
+            texts.append({"text": item, "text_id": f"text{i+1}"})
+            continue
+        text_entry = {
+            "text": item.text
+        }
+        if item.text_id:
+            text_entry["text_id"] = item.text_id
+        texts.append(text_entry)
+    return texts
+
 @router.post("/tokens/batch-count", response_model=BatchTokenCountResponse, tags=["tokens"])
 @limiter.limit("20/minute")
 async def batch_count_tokens(
@@ -57,16 +76,7 @@ async def batch_count_tokens(
     Returns token counts and metadata for each text.
     """
     try:
-        # Convert the request format to what our service expects
-        texts = []
-        for item in batch_request.texts:
-            text_entry = {
-                "text": item.text
-            }
-            if item.text_id:
-                text_entry["text_id"] = item.text_id
-            texts.append(text_entry)
-                
+        texts = _batch_texts(batch_request)
         results = token_counter.batch_count_tokens(texts, batch_request.model)
         return {"results": results}
     except Exception as e:
@@ -75,4 +85,40 @@ async def batch_count_tokens(
             detail=f"Error batch counting tokens: {str(e)}"
         )
 
+@router.post("/tokens/batch-count/stream", tags=["tokens"])
+@limiter.limit("20/minute")
+async def stream_batch_count_tokens(
+    request: Request,  # Add the Request parameter for the limiter
+    batch_request: BatchTokenCountRequest,
+    username: str = Depends(verify_credentials)
+):
+    """
+    Count tokens for multiple text inputs, streaming results as they are computed.
+    
+    Returns newline-delimited JSON, one token count result per text in request order.
+    """
+    # Resolve the encoder before streaming starts so failures can still return a 500
+    try:
+        token_counter.get_encoder(batch_request.model or get_settings().DEFAULT_MODEL)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error batch counting tokens: {str(e)}"
+        )
+    
+    texts = _batch_texts(batch_request)
+    
+    def generate():
+        for item in texts:
+            try:
+                result = token_counter.count_tokens(item["text"], batch_request.model)
+            except Exception as e:
+                # The 200 status is already sent, so report the failure in-band
+                result = {"error": f"Error counting tokens: {str(e)}"}
+            if item.get("text_id"):
+                result["text_id"] = item["text_id"]
+            yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 # Generated by Copilot
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     API_PASSWORD: str = "password"
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_PERIOD: int = 60  # seconds
+    RATE_LIMIT_STORAGE_URI: str = "memory://"  # e.g. redis://redis:6379/0 to share limits across workers
     
     # Supported models and their configurations
     SUPPORTED_MODELS: List[str] = ["gpt-3.5-turbo", "gpt-4", "text-davinci-003"]
@@ -3,19 +3,38 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 import secrets
+from typing import Optional, Tuple
 
 from app.core.config import get_settings
 
 security = HTTPBasic()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=get_settings().RATE_LIMIT_STORAGE_URI,
+    strategy="fixed-window",
+    # Keep limiting in process memory if the shared storage is unreachable
+    in_memory_fallback_enabled=True,
+)
+
+# Expected credentials, encoded once on first use
+_CREDS: Optional[Tuple[bytes, bytes]] = None
+
+def _creds() -> Tuple[bytes, bytes]:
+    """Get the configured username and password as bytes."""
+    global _CREDS
+    if _CREDS is None:
+        settings = get_settings()
+        _CREDS = (settings.API_USERNAME.encode(), settings.API_PASSWORD.encode())
+    return _CREDS
 
 def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
     """Verify HTTP Basic Auth credentials."""
-    settings = get_settings()
-    correct_username = secrets.compare_digest(credentials.username, settings.API_USERNAME)
-    correct_password = secrets.compare_digest(credentials.password, settings.API_PASSWORD)
+    username, password = _creds()
+    correct_username = secrets.compare_digest(credentials.username.encode(), username)
+    correct_password = secrets.compare_digest(credentials.password.encode(), password)
     
-    if not (correct_username and correct_password):
+    # Bitwise & so both comparisons always run
+    if not (correct_username & correct_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
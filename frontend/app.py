@@ -1,9 +1,13 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import base64
 import json
+import orjson
 import os
+import pandas as pd
 from pathlib import Path
+from dotenv import load_dotenv
 
 # Set page config first - this must be the first Streamlit command
 st.set_page_config(
@@ -12,61 +16,217 @@ st.set_page_config(
     layout="wide"
 )
 
+# Load the project .env once per process; existing environment variables take precedence
+@st.cache_resource
+def _load_env():
+    load_dotenv(Path(__file__).parent.parent / ".env")
+    return True
+
+_load_env()
+
+# Session state defaults, read from the environment once per process
+@st.cache_resource
+def _session_defaults():
+    return {
+        "api_host": os.getenv("API_HOST", "http://localhost:8000"),
+        "api_username": os.getenv("API_USERNAME", ""),
+        "api_password": os.getenv("API_PASSWORD", ""),
+        "credentials_valid": False,
+    }
+
 # Initialize session state for credentials
-if 'api_host' not in st.session_state:
-    st.session_state.api_host = os.getenv("API_HOST", "http://localhost:8000")
-if 'api_username' not in st.session_state:
-    st.session_state.api_username = os.getenv("API_USERNAME", "")
-if 'api_password' not in st.session_state:
-    st.session_state.api_password = os.getenv("API_PASSWORD", "")
-if 'credentials_valid' not in st.session_state:
-    st.session_state.credentials_valid = False
+for key, value in _session_defaults().items():
+    st.session_state.setdefault(key, value)
+
+# Auth header is memoized per (username, password) so the base64 work happens once
+@st.cache_data(show_spinner=False)
+def _auth_header(username, password):
+    credentials = username.encode() + b":" + password.encode()
+    # requests accepts bytes header values, so skip decoding back to str
+    return {"Authorization": b"Basic " + base64.b64encode(credentials)}
 
 # Function to get auth header from session state
 def get_auth_header():
-    credentials = f"{st.session_state.api_username}:{st.session_state.api_password}"
-    encoded_credentials = base64.b64encode(credentials.encode()).decode()
-    return {"Authorization": f"Basic {encoded_credentials}"}
+    return _auth_header(st.session_state.api_username, st.session_state.api_password)
+
+# (connect, read) timeout in seconds for every API call
+HTTP_TIMEOUT = (3, 30)
+
+# Batches with more distinct texts than this are streamed so rows show up as they are counted
+STREAM_THRESHOLD = 50
+
+# Shared HTTP session so keep-alive connections are reused across reruns
+@st.cache_resource
+def get_http():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class APIError(Exception):
+    """Raised when the API responds with a non-200 status."""
 
 # API interaction functions
-def count_tokens(text, model):
-    """Call the token counting API for a single text."""
-    url = f"{st.session_state.api_host}/v1/tokens/count"
+# Results are cached per (host, credentials, input) so repeated clicks skip the network.
+# Errors are raised rather than returned so failed calls are never cached.
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _fetch_token_count(api_host, auth_header, text, model):
+    url = f"{api_host}/v1/tokens/count"
     payload = {
         "text": text,
         "model": model
     }
     
+    response = get_http().post(
+        url,
+        data=orjson.dumps(payload),
+        headers={**auth_header, "Content-Type": "application/json"},
+        timeout=HTTP_TIMEOUT
+    )
+    if response.status_code != 200:
+        raise APIError(f"API Error: {response.status_code} - {response.text}")
+    return response.json()
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _fetch_batch_count(api_host, auth_header, texts, model):
+    url = f"{api_host}/v1/tokens/batch-count"
+    payload = {
+        # Plain strings; the API assigns IDs text1, text2, ... by position
+        "texts": texts,
+        "model": model
+    }
+    
+    response = get_http().post(
+        url,
+        data=orjson.dumps(payload),
+        headers={**auth_header, "Content-Type": "application/json"},
+        timeout=HTTP_TIMEOUT
+    )
+    if response.status_code != 200:
+        raise APIError(f"API Error: {response.status_code} - {response.text}")
+    return response.json()
+
+def _stream_batch_count(api_host, auth_header, texts, model):
+    """Yield batch token count results one at a time from the streaming endpoint."""
+    url = f"{api_host}/v1/tokens/batch-count/stream"
+    payload = {
+        "texts": texts,
+        "model": model
+    }
+    
+    with get_http().post(
+        url,
+        data=orjson.dumps(payload),
+        headers={**auth_header, "Content-Type": "application/json"},
+        stream=True,
+        timeout=HTTP_TIMEOUT
+    ) as response:
+        if response.status_code != 200:
+            raise APIError(f"API Error: {response.status_code} - {response.text}")
+        for line in response.iter_lines():
+            if line:
+                yield orjson.loads(line)
+
+def check_health(api_host):
+    """Check the health endpoint, raising APIError on a non-200 status."""
+    response = get_http().get(f"{api_host}/v1/health", timeout=HTTP_TIMEOUT)
+    if response.status_code != 200:
+        raise APIError(f"❌ API Error: {response.status_code}")
+    return response.status_code
+
+def count_tokens(text, model):
+    """Call the token counting API for a single text."""
     try:
-        response = requests.post(url, json=payload, headers=get_auth_header())
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"API Error: {response.status_code} - {response.text}")
+        return _fetch_token_count(st.session_state.api_host, get_auth_header(), text, model)
+    except APIError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"Error connecting to API: {str(e)}")
     
     return None
 
-def batch_count_tokens(texts, model):
-    """Call the batch token counting API."""
-    url = f"{st.session_state.api_host}/v1/tokens/batch-count"
-    payload = {
-        "texts": [{"text": text, "text_id": f"text{i+1}"} for i, text in enumerate(texts)],
-        "model": model
-    }
+def _expand_results(texts, by_text):
+    """Map results back to input lines, with IDs by original position.
     
+    Lines whose text has no result yet are skipped, so this also works on partial results.
+    Repeated lines weren't processed again, so they carry no processing time.
+    """
+    expanded_texts, rows, seen = [], [], set()
+    for i, text in enumerate(texts):
+        if text not in by_text:
+            continue
+        row = {**by_text[text], "text_id": f"text{i+1}"}
+        if text in seen:
+            row["processing_time_ms"] = None
+        seen.add(text)
+        expanded_texts.append(text)
+        rows.append(row)
+    return expanded_texts, rows
+
+def results_frame(texts, results):
+    """Build the batch results table from input texts and their matching results."""
+    return pd.DataFrame({
+        "Text ID": [r.get("text_id", f"text{i+1}") for i, r in enumerate(results)],
+        "Text": [t[:50] + "..." if len(t) > 50 else t for t in texts],
+        "Token Count": [r["token_count"] for r in results],
+        "Processing Time (ms)": [r["processing_time_ms"] for r in results]
+    })
+
+def batch_count_tokens(texts, model, placeholder=None):
+    """Call the batch token counting API.
+    
+    Returns (rows, api_response): one row per input line for display, and the API's own
+    results for the distinct texts that were sent. Large batches are streamed, with partial
+    results rendered into placeholder as they arrive.
+    """
     try:
-        response = requests.post(url, json=payload, headers=get_auth_header())
-        if response.status_code == 200:
-            return response.json()
+        # Send each distinct text once (as a tuple, since lists are unhashable for the cache)
+        unique_texts = tuple(dict.fromkeys(texts))
+        if placeholder is not None and len(unique_texts) > STREAM_THRESHOLD:
+            by_text = {}
+            next_redraw = 1
+            try:
+                rows = _stream_batch_count(st.session_state.api_host, get_auth_header(), unique_texts, model)
+                for text, row in zip(unique_texts, rows):
+                    if "error" in row:
+                        raise APIError(f"API Error: {row['error']}")
+                    by_text[text] = row
+                    # Each redraw rebuilds the whole table, so double the gap between redraws
+                    # to keep total rendering work at O(N log N)
+                    if len(by_text) == next_redraw:
+                        placeholder.dataframe(results_frame(*_expand_results(texts, by_text)))
+                        next_redraw *= 2
+                if len(by_text) < len(unique_texts):
+                    raise APIError("API Error: streamed response ended early")
+            except Exception:
+                # Don't leave an incomplete table next to the error
+                placeholder.empty()
+                raise
+            api_response = {"results": list(by_text.values())}
         else:
-            st.error(f"API Error: {response.status_code} - {response.text}")
+            api_response = _fetch_batch_count(st.session_state.api_host, get_auth_header(), unique_texts, model)
+            by_text = dict(zip(unique_texts, api_response["results"]))
+        
+        # Fan results back out to one per input line, leaving the API response untouched
+        _, rows = _expand_results(texts, by_text)
+        return rows, api_response
+    except APIError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"Error connecting to API: {str(e)}")
     
     return None
 
+# Sidebar debug text only depends on env-derived values, so build it once
+@st.cache_data(show_spinner=False)
+def _debug_block(api_host, api_username, password_length):
+    return (
+        f"- API_HOST: {api_host}\n"
+        f"- API_USERNAME: {api_username}\n"
+        f"- API_PASSWORD: {'*' * password_length}\n"
+    )
+
 # Main app UI
 st.title("🔢 Token Counter")
 st.markdown("""
@@ -78,20 +238,24 @@ This helps estimate token usage for OpenAI API calls.
 with st.sidebar:
     st.title("API Connection")
     
-    # API Host URL
-    api_host = st.text_input(
-        "API Host URL",
-        value=st.session_state.api_host,
-        help="The URL of the Token Counter API"
-    )
-    
-    # API Credentials
-    st.subheader("API Credentials")
-    api_username = st.text_input("Username", value=st.session_state.api_username)
-    api_password = st.text_input("Password", value=st.session_state.api_password, type="password")
+    # Inputs live in a form so typing doesn't rerun the script until submit
+    with st.form("creds"):
+        # API Host URL
+        api_host = st.text_input(
+            "API Host URL",
+            value=st.session_state.api_host,
+            help="The URL of the Token Counter API"
+        )
+        
+        # API Credentials
+        st.subheader("API Credentials")
+        api_username = st.text_input("Username", value=st.session_state.api_username)
+        api_password = st.text_input("Password", value=st.session_state.api_password, type="password")
+        
+        # Test connection button
+        submitted = st.form_submit_button("Test Connection")
     
-    # Test connection button
-    if st.button("Test Connection"):
+    if submitted:
         # Save values to session state
         st.session_state.api_host = api_host
         st.session_state.api_username = api_username
@@ -99,13 +263,12 @@ with st.sidebar:
         
         # Test connection
         try:
-            response = requests.get(f"{api_host}/v1/health", headers=get_auth_header())
-            if response.status_code == 200:
-                st.success("✅ API Connected Successfully")
-                st.session_state.credentials_valid = True
-            else:
-                st.error(f"❌ API Error: {response.status_code}")
-                st.session_state.credentials_valid = False
+            check_health(api_host)
+            st.success("✅ API Connected Successfully")
+            st.session_state.credentials_valid = True
+        except APIError as e:
+            st.error(str(e))
+            st.session_state.credentials_valid = False
         except Exception as e:
             st.error(f"❌ Connection Error: {str(e)}")
             st.session_state.credentials_valid = False
@@ -129,6 +292,91 @@ with st.sidebar:
     streamlit run frontend/app.py
     ```
     """)
+    
+    # Debug/configuration details from the environment
+    with st.expander("Debug Info"):
+        defaults = _session_defaults()
+        st.code(_debug_block(
+            defaults["api_host"],
+            defaults["api_username"],
+            len(defaults["api_password"])
+        ))
+
+# Tab bodies run as fragments so a button press only reruns its own tab
+@st.fragment
+def single_tab(model):
+    st.header("Count Tokens in Text")
+    
+    user_text = st.text_area(
+        "Enter text to count tokens", 
+        height=200,
+        placeholder="Type or paste your text here..."
+    )
+    
+    if st.button("Count Tokens", key="single_count"):
+        if user_text.strip():
+            with st.spinner("Counting tokens..."):
+                result = count_tokens(user_text, model)
+                
+                if result:
+                    st.success(f"Text contains {result['token_count']} tokens")
+                    
+                    # Results in expandable section
+                    with st.expander("View Full Results"):
+                        st.json(result)
+                        
+                    # Visualization
+                    st.metric("Token Count", result['token_count'])
+                    st.metric("Processing Time (ms)", result['processing_time_ms'])
+        else:
+            st.warning("Please enter some text")
+
+@st.fragment
+def batch_tab(model):
+    st.header("Batch Token Counting")
+    
+    # Add instructions
+    st.markdown("""
+    Enter multiple texts, one per line. Each line will be processed as a separate text.
+    """)
+    
+    batch_text = st.text_area(
+        "Enter multiple texts (one per line)",
+        height=200,
+        placeholder="Text 1\nText 2\nText 3"
+    )
+    
+    if st.button("Process Batch", key="batch_count"):
+        if batch_text.strip():
+            # Split by lines and remove empty lines
+            texts = [line for line in batch_text.split('\n') if line.strip()]
+            
+            if texts:
+                # Holds partial results while streaming, then the final table
+                table = st.empty()
+                with st.spinner(f"Processing {len(texts)} texts..."):
+                    results = batch_count_tokens(texts, model, placeholder=table)
+                    
+                    if results:
+                        rows, api_response = results
+                        st.success(f"Processed {len(rows)} texts")
+                        
+                        # Create a dataframe for better visualization
+                        df = results_frame(texts, rows)
+                        
+                        table.dataframe(df)
+                        
+                        # Total tokens
+                        total_tokens = sum(r["token_count"] for r in rows)
+                        st.metric("Total Tokens", total_tokens)
+                        
+                        # Full results in expandable section
+                        with st.expander("View Raw API Results"):
+                            st.json(api_response)
+            else:
+                st.warning("No valid texts found. Please enter at least one text.")
+        else:
+            st.warning("Please enter some texts")
 
 # Check credentials before showing main UI
 if not st.session_state.credentials_valid:
@@ -139,81 +387,8 @@ else:
     
     # Single text tab
     with tab1:
-        st.header("Count Tokens in Text")
-        
-        user_text = st.text_area(
-            "Enter text to count tokens", 
-            height=200,
-            placeholder="Type or paste your text here..."
-        )
-        
-        if st.button("Count Tokens", key="single_count"):
-            if user_text.strip():
-                with st.spinner("Counting tokens..."):
-                    result = count_tokens(user_text, selected_model)
-                    
-                    if result:
-                        st.success(f"Text contains {result['token_count']} tokens")
-                        
-                        # Results in expandable section
-                        with st.expander("View Full Results"):
-                            st.json(result)
-                            
-                        # Visualization
-                        st.metric("Token Count", result['token_count'])
-                        st.metric("Processing Time (ms)", result['processing_time_ms'])
-            else:
-                st.warning("Please enter some text")
+        single_tab(selected_model)
 
     # Batch processing tab
     with tab2:
-        st.header("Batch Token Counting")
-        
-        # Add instructions
-        st.markdown("""
-        Enter multiple texts, one per line. Each line will be processed as a separate text.
-        """)
-        
-        batch_text = st.text_area(
-            "Enter multiple texts (one per line)",
-            height=200,
-            placeholder="Text 1\nText 2\nText 3"
-        )
-        
-        if st.button("Process Batch", key="batch_count"):
-            if batch_text.strip():
-                # Split by lines and remove empty lines
-                texts = [line for line in batch_text.split('\n') if line.strip()]
-                
-                if texts:
-                    with st.spinner(f"Processing {len(texts)} texts..."):
-                        results = batch_count_tokens(texts, selected_model)
-                        
-                        if results and 'results' in results:
-                            st.success(f"Processed {len(results['results'])} texts")
-                            
-                            # Create a dataframe for better visualization
-                            import pandas as pd
-                            df = pd.DataFrame([
-                                {
-                                    "Text ID": r.get("text_id", f"text{i+1}"),
-                                    "Text": texts[i][:50] + "..." if len(texts[i]) > 50 else texts[i],
-                                    "Token Count": r["token_count"],
-                                    "Processing Time (ms)": r["processing_time_ms"]
-                                }
-                                for i, r in enumerate(results['results'])
-                            ])
-                            
-                            st.dataframe(df)
-                            
-                            # Total tokens
-                            total_tokens = sum(r["token_count"] for r in results['results'])
-                            st.metric("Total Tokens", total_tokens)
-                            
-                            # Full results in expandable section
-                            with st.expander("View Raw API Results"):
-                                st.json(results)
-                else:
-                    st.warning("No valid texts found. Please enter at least one text.")
-            else:
-                st.warning("Please enter some texts")
+        batch_tab(selected_model)
@@ -1,10 +1,12 @@
 from fastapi.testclient import TestClient
 import pytest
 import base64
+import json
 import os
 from dotenv import load_dotenv
 
 from app.main import app
+from app.services.token_counter import token_counter
 
 # Load environment variables for tests
 load_dotenv()
@@ -68,6 +70,73 @@ def test_batch_token_count_endpoint(test_client, auth_headers):
     assert data["results"][0]["token_count"] == 3
     assert data["results"][1]["text_id"] == "text2"
 
+def test_batch_token_count_plain_strings(test_client, auth_headers):
+    """Test the batch endpoint with plain string texts."""
+    payload = {
+        "texts": ["Hello world!", "This is another example."],
+        "model": "gpt-3.5-turbo"
+    }
+    
+    response = test_client.post("/v1/tokens/batch-count", json=payload, headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["results"]) == 2
+    assert data["results"][0]["text_id"] == "text1"
+    assert data["results"][0]["token_count"] == 3
+    assert data["results"][1]["text_id"] == "text2"
+
+def test_stream_batch_token_count_endpoint(test_client, auth_headers):
+    """Test the streaming batch endpoint returns one JSON line per text."""
+    payload = {
+        "texts": ["Hello world!", {"text": "This is another example.", "text_id": "custom"}],
+        "model": "gpt-3.5-turbo"
+    }
+    
+    response = test_client.post("/v1/tokens/batch-count/stream", json=payload, headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(results) == 2
+    assert results[0]["text_id"] == "text1"
+    assert results[0]["token_count"] == 3
+    assert results[1]["text_id"] == "custom"
+
+def test_stream_batch_token_count_encoder_error(test_client, auth_headers, monkeypatch):
+    """Test the streaming batch endpoint returns a 500 when no encoder can be loaded."""
+    def fail(model):
+        raise RuntimeError("encoding unavailable")
+    
+    monkeypatch.setattr(token_counter, "get_encoder", fail)
+    payload = {"texts": ["Hello world!"], "model": "gpt-3.5-turbo"}
+    
+    response = test_client.post("/v1/tokens/batch-count/stream", json=payload, headers=auth_headers)
+    
+    assert response.status_code == 500
+    assert "encoding unavailable" in response.json()["detail"]
+
+def test_stream_batch_token_count_item_error(test_client, auth_headers, monkeypatch):
+    """Test the streaming batch endpoint writes an error line when a text fails."""
+    original_count_tokens = token_counter.count_tokens
+    
+    def count_tokens(text, model=None):
+        if text == "bad":
+            raise RuntimeError("tokenizer failure")
+        return original_count_tokens(text, model)
+    
+    monkeypatch.setattr(token_counter, "count_tokens", count_tokens)
+    payload = {"texts": ["Hello world!", "bad"], "model": "gpt-3.5-turbo"}
+    
+    response = test_client.post("/v1/tokens/batch-count/stream", json=payload, headers=auth_headers)
+    
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(results) == 2
+    assert results[0]["token_count"] == 3
+    assert results[1]["text_id"] == "text2"
+    assert "tokenizer failure" in results[1]["error"]
+
 def test_authentication(test_client):
     """Test that authentication is required."""
     payload = {"text": "Hello world!"}
@@ -77,4 +146,16 @@ def test_authentication(test_client):
     # Should be unauthorized without credentials
     assert response.status_code == 401
 
+def test_invalid_credentials(test_client):
+    """Test that a wrong password is rejected."""
+    payload = {"text": "Hello world!"}
+    username = os.getenv("API_USERNAME", "admin")
+    credentials = base64.b64encode(f"{username}:wrong-password".encode()).decode()
+    
+    response = test_client.post(
+        "/v1/tokens/count", json=payload, headers={"Authorization": f"Basic {credentials}"}
+    )
+    
+    assert response.status_code == 401
+
 # Generated by Copilot